@@ -25,37 +25,11 @@ def clean_up_key_value(dict):
         >>> clean_up_key_value({' name ': '  John  ', '  ': 'remove_me'})
         {'name': 'John'}
     """
-    cleaned_dict = {}
-    
-    for key, value in dict.items():
-        # Step 1: Filter out empty or whitespace-only keys
-        # - Skip if key is falsy (0, False, None, etc.)
-        # - Skip if key is a string with only whitespace
-        if not key:
-            continue
-        
-        if isinstance(key, str) and not key.strip():
-            # Key is a string with only whitespace, skip it
-            continue
-        
-        # Step 2: Clean up the key (strip whitespace if it's a string)
-        cleaned_key = key.strip() if isinstance(key, str) else key
-        
-        # Step 3: Clean up the value (strip whitespace if it's a string)
-        # - If value is falsy (empty string, 0, False, None), keep it as-is
-        # - If value is a string, strip it
-        # - If value is not a string, keep it as-is
-        if value and isinstance(value, str):
-            # Value is a non-empty string, strip it
-            cleaned_value = value.strip()
-        else:
-            # Value is either falsy, a non-string type, or empty string (keep as-is)
-            cleaned_value = value
-        
-        # Step 4: Add the cleaned key-value pair to the result
-        cleaned_dict[cleaned_key] = cleaned_value
-    
-    return cleaned_dict
+    # a key is kept if it is truthy after stripping, i.e. falsy keys (0, False, None) and blank strings are dropped.
+    # the stripped key is bound in the filter so each key is stripped once.
+    return {cleaned_key: (value.strip() if isinstance(value, str) else value)
+            for key, value in dict.items()
+            if (cleaned_key := key.strip() if isinstance(key, str) else key)}
 
 """
 Removes leading and trailing spaces from header names
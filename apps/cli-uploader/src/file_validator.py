@@ -21,7 +21,11 @@ For metadata: validate data folder contains TSV or TXT files
 Compose a list of files to be updated and their sizes (metadata or files)
 """
 class FileValidator:
-    
+    # reserved or illegal characters in file name
+    RESERVED_CHARS = re.compile(r'[*:|]')
+    # superset of absolute path prefixes and reserved characters, one scan rules out both checks for valid names
+    INVALID_FILE_NAME_CHARS = re.compile(r'^[\\/]|[*:|]')
+
     def __init__(self, configs):
         self.configs = configs
         self.uploadType = configs.get(UPLOAD_TYPE)
@@ -169,55 +173,66 @@ class FileValidator:
     
     # validate file name listed manifest
     def validate_file_name(self):
-        msg = None
-        is_valid = True
-        line_num = 2
+        # (line number, message) of errors, logged at once at the end, one line per error in line order
+        errors = []
         file_name_config = self.configs.get(FILE_NAME_FIELD)
         md5_config = self.configs.get(FILE_MD5_FIELD)
+        # only the file name and md5 columns are validated, extract them once instead of reading each row dict
+        file_names = [row[file_name_config] for row in self.manifest_rows]
+        md5s = [row[md5_config] for row in self.manifest_rows]
+        reserved_chars = self.RESERVED_CHARS
+        invalid_chars = self.INVALID_FILE_NAME_CHARS
+        # file name -> [md5, line numbers], line numbers is None once the file name is found not unique
+        file_name_lines = {}
         self.log.info("Start validating file names listed in pre-manifest:")
-        for row in self.manifest_rows:
-            file_name = row[file_name_config]
+        for line_num, (file_name, md5) in enumerate(zip(file_names, md5s), start=2):
+            # check if file name contains non-unicode characters, ascii names are always encodable
+            is_unicode = True
+            printable_name = file_name
+            if not file_name.isascii():
+                try:
+                    file_name.encode('utf-8')
+                except UnicodeEncodeError:
+                    is_unicode = False
+                    # escape the invalid characters in all messages so they can't break logging the joined errors
+                    printable_name = file_name.encode('utf-8', 'backslashreplace').decode('utf-8')
+
             if not file_name or not file_name.strip():
-                msg = f"Line {line_num}: File name is empty!"
-                is_valid = False
-                self.log.error(msg)
-            md5 = row[md5_config]
-            # check if file name is unique by count the file name
-            same_file_name_list  = [file for file in self.manifest_rows if file[file_name_config] == file_name and file[md5_config] != md5]
-            if len(same_file_name_list) > 0:
-                msg = f"Line {line_num}: File name {file_name} is not unique in the manifest!"
-                is_valid = False
-                self.log.error(msg)
+                errors.append((line_num, f"Line {line_num}: File name is empty!"))
+            # check if file name is unique, a file name listed with different md5s is not unique on all its lines
+            name_lines = file_name_lines.get(file_name)
+            if name_lines is None:
+                file_name_lines[file_name] = [md5, [line_num]]
+            elif name_lines[1] is not None and name_lines[0] == md5:
+                name_lines[1].append(line_num)
+            else:
+                # report the previous lines of the file name when it is first found not unique
+                for prev_line_num in name_lines[1] or []:
+                    errors.append((prev_line_num, f"Line {prev_line_num}: File name {printable_name} is not unique in the manifest!"))
+                name_lines[1] = None
+                errors.append((line_num, f"Line {line_num}: File name {printable_name} is not unique in the manifest!"))
 
-            # check file name is a absolute path
-            if os.path.isabs(file_name):
-                msg = f'Line {line_num}: File name "{file_name}" is invalid, no absolute path allowed!'
-                is_valid = False
-                self.log.error(msg)
+            if invalid_chars.search(file_name):
+                # check file name is a absolute path
+                if os.path.isabs(file_name):
+                    errors.append((line_num, f'Line {line_num}: File name "{printable_name}" is invalid, no absolute path allowed!'))
 
-            # check if file name contains reserved or illegal characters *, :, and |
-            if re.search(r'[*:|]', file_name):
-                msg = f"Line {line_num}: File name {file_name} contains invalid characters!"
-                is_valid = False
-                self.log.error(msg)
+                # check if file name contains reserved or illegal characters *, :, and |
+                if reserved_chars.search(file_name):
+                    errors.append((line_num, f"Line {line_num}: File name {printable_name} contains invalid characters!"))
 
             if len(file_name) > 255:
-                msg = f"Line {line_num}: File name {file_name} is too long!"
-                is_valid = False
-                self.log.error(msg)
-
-            # check if file name contains non-unicode characters
-            try:
-                file_name.encode('utf-8')
-            except UnicodeEncodeError:
-                msg = f"Line {line_num}: File name {file_name} contains non-unicode characters!"
-                is_valid = False
-                self.log.error(msg)
+                errors.append((line_num, f"Line {line_num}: File name {printable_name} is too long!"))
 
+            if not is_unicode:
+                errors.append((line_num, f"Line {line_num}: File name {printable_name} contains non-unicode characters!"))
 
-            line_num += 1
+        if errors:
+            # earlier lines of a non-unique file name are only found later, sort to report errors in line order
+            errors.sort(key=lambda error: error[0])
+            self.log.error("\n".join(msg for _, msg in errors))
         self.log.info("Completed validating file names listed in pre-manifest.")
-        return is_valid
+        return not errors
 
     #public function to read pre-manifest and return list of file records 
     def read_manifest(self, is_archive_manifest=False):
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Add src to path for imports, once for all test modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -1,19 +1,30 @@
 import os
 import sys
+import copy
+import functools
 import yaml
 import pytest
 from unittest.mock import patch
 from bento.common.utils import get_logger
 from upload_config import Config
 
+# use the libyaml-backed loader when available, it parses much faster than the pure-python one
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_cfg(config_file):
+    """Parse the test config file once per path"""
+    with open(config_file) as c_file:
+        return yaml.load(c_file, Loader=_YAML_LOADER)['Config']
+
 
 @pytest.fixture
 def config_data():
-    """Fixture to load test config data"""
+    """Fixture to load test config data, a fresh copy per test since Config.validate() mutates it"""
     config_file = "../../config/test-file-config.yml"
     if config_file and os.path.isfile(config_file):
-        with open(config_file) as c_file:
-            return yaml.safe_load(c_file)['Config']
+        return copy.deepcopy(_load_cfg(config_file))
     return None
 
 
@@ -1,12 +1,7 @@
 #!/usr/bin/env python3
 from unittest.mock import Mock, MagicMock, patch
-import os
-import sys
 import pytest
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from file_validator import FileValidator
 from common.constants import (
     FILE_NAME_DEFAULT, FILE_SIZE_DEFAULT, MD5_DEFAULT, FILE_NAME_FIELD, 
@@ -30,15 +25,31 @@ def mock_configs():
     }
 
 
+@pytest.fixture(scope="module")
+def patched_get_logger():
+    """Fixture patching get_logger once for all tests in the module"""
+    with patch('file_validator.get_logger') as mock_get_logger:
+        yield mock_get_logger
+
+
 @pytest.fixture
-def validator(mock_configs):
+def validator(mock_configs, patched_get_logger):
     """Fixture for FileValidator instance"""
-    with patch('file_validator.get_logger'):
-        validator_instance = FileValidator(mock_configs)
-        validator_instance.log = Mock()
+    validator_instance = FileValidator(mock_configs)
+    validator_instance.log = Mock()
     return validator_instance
 
 
+def last_error(validator):
+    """Return the last error message logged by the validator"""
+    return error_messages(validator)[-1]
+
+
+def error_messages(validator):
+    """Return all error messages logged by the validator, file name errors are logged together one per line"""
+    return [msg for c in validator.log.error.call_args_list for msg in c[0][0].split("\n")]
+
+
 class TestValidateFileName:
     """Unit tests for FileValidator.validate_file_name method"""
 
@@ -69,7 +80,7 @@ class TestValidateFileName:
         
         assert not result, "Should return False for empty file name"
         validator.log.error.assert_called()
-        error_msg = validator.log.error.call_args[0][0]
+        error_msg = last_error(validator)
         assert "File name is empty" in error_msg
         assert "Line 2" in error_msg
 
@@ -84,7 +95,7 @@ class TestValidateFileName:
         result = validator.validate_file_name()
         
         assert not result, "Should return False for whitespace-only file name"
-        error_msg = validator.log.error.call_args[0][0]
+        error_msg = last_error(validator)
         assert "File name is empty" in error_msg
 
     def test_validate_file_name_duplicate_same_md5(self, validator):
@@ -112,7 +123,7 @@ class TestValidateFileName:
         result = validator.validate_file_name()
         
         assert not result, "Should return False for non-unique file names with different md5s"
-        error_msg = validator.log.error.call_args[0][0]
+        error_msg = last_error(validator)
         assert "is not unique" in error_msg
         assert "Line 3" in error_msg
 
@@ -127,7 +138,7 @@ class TestValidateFileName:
         result = validator.validate_file_name()
         
         assert not result, "Should return False for absolute Unix path"
-        error_msg = validator.log.error.call_args[0][0]
+        error_msg = last_error(validator)
         assert "is invalid" in error_msg
         assert "no absolute path allowed" in error_msg
 
@@ -142,7 +153,7 @@ class TestValidateFileName:
         result = validator.validate_file_name()
         
         assert not result, "Should return False for file name with asterisk"
-        error_msg = validator.log.error.call_args[0][0]
+        error_msg = last_error(validator)
         assert "contains invalid characters" in error_msg
 
     def test_validate_file_name_reserved_character_pipe(self, validator):
@@ -156,7 +167,7 @@ class TestValidateFileName:
         result = validator.validate_file_name()
         
         assert not result, "Should return False for file name with pipe"
-        error_msg = validator.log.error.call_args[0][0]
+        error_msg = last_error(validator)
         assert "contains invalid characters" in error_msg
 
     def test_validate_file_name_valid_special_characters(self, validator):
@@ -199,7 +210,7 @@ class TestValidateFileName:
         result = validator.validate_file_name()
         
         assert not result
-        error_msg = validator.log.error.call_args[0][0]
+        error_msg = last_error(validator)
         assert "Line 3" in error_msg
 
     def test_validate_file_name_multiple_errors(self, validator):
@@ -215,8 +226,9 @@ class TestValidateFileName:
         result = validator.validate_file_name()
         
         assert not result, "Should return False with multiple errors"
-        # Check that multiple error logs were called
-        assert validator.log.error.call_count == 3
+        # Check that all errors were logged together
+        validator.log.error.assert_called_once()
+        assert len(error_messages(validator)) == 3
 
     def test_validate_file_name_unicode_characters(self, validator):
         """Test validation passes for file names with unicode characters"""
@@ -246,6 +258,24 @@ class TestValidateFileName:
         
         assert not result, "Should not pass for file names with non-unicode characters"
 
+    def test_validate_file_name_non_unicode_with_other_errors(self, validator):
+        """Test the joined error message stays encodable when a non-unicode name has other errors"""
+        validator.manifest_rows = [
+            {'file_name': '/abs.txt', 'md5sum': 'abc123'},
+            {'file_name': 'a|' + chr(0xDC80), 'md5sum': 'def456'},
+        ]
+        validator.configs[FILE_NAME_FIELD] = 'file_name'
+        validator.configs[FILE_MD5_FIELD] = 'md5sum'
+
+        result = validator.validate_file_name()
+
+        assert not result
+        validator.log.error.call_args[0][0].encode('utf-8')
+        error_msgs = error_messages(validator)
+        assert any("Line 2" in m and "no absolute path allowed" in m for m in error_msgs)
+        assert any("Line 3" in m and "contains invalid characters" in m for m in error_msgs)
+        assert any("Line 3" in m and "contains non-unicode characters" in m for m in error_msgs)
+
     def test_validate_file_name_long_filename(self, validator):
         """Test validation passes for very long file names"""
         long_name = 'a' * 251 + '.txt'
@@ -274,7 +304,42 @@ class TestValidateFileName:
         
         assert not result
         # Should have errors logged for both duplicate files
-        assert validator.log.error.call_count >= 2
+        assert len(error_messages(validator)) >= 2
+
+    def test_validate_file_name_duplicate_reports_all_lines(self, validator):
+        """Test all lines of a non-unique file name are reported, including earlier same-md5 lines"""
+        validator.manifest_rows = [
+            {'file_name': 'file1.txt', 'md5sum': 'abc123'},
+            {'file_name': 'file1.txt', 'md5sum': 'abc123'},
+            {'file_name': 'file2.txt', 'md5sum': 'ghi789'},
+            {'file_name': 'file1.txt', 'md5sum': 'def456'},
+        ]
+        validator.configs[FILE_NAME_FIELD] = 'file_name'
+        validator.configs[FILE_MD5_FIELD] = 'md5sum'
+
+        result = validator.validate_file_name()
+
+        assert not result
+        error_msgs = error_messages(validator)
+        assert len(error_msgs) == 3
+        for line in ("Line 2", "Line 3", "Line 5"):
+            assert any(line in msg and "is not unique" in msg for msg in error_msgs)
+
+    def test_validate_file_name_errors_in_line_order(self, validator):
+        """Test earlier lines of a non-unique file name are reported in line order with other errors"""
+        validator.manifest_rows = [
+            {'file_name': 'file1.txt', 'md5sum': 'abc123'},
+            {'file_name': '', 'md5sum': 'def456'},
+            {'file_name': 'file1.txt', 'md5sum': 'ghi789'},
+        ]
+        validator.configs[FILE_NAME_FIELD] = 'file_name'
+        validator.configs[FILE_MD5_FIELD] = 'md5sum'
+
+        result = validator.validate_file_name()
+
+        assert not result
+        error_msgs = error_messages(validator)
+        assert [msg.split(":")[0] for msg in error_msgs] == ["Line 2", "Line 3", "Line 4"]
 
     def test_validate_file_name_empty_manifest(self, validator):
         """Test validation passes for empty manifest"""
@@ -338,51 +403,35 @@ class TestValidateFileName:
 class TestValidateFileNameEdgeCases:
     """Edge case tests for FileValidator.validate_file_name method"""
 
-    def test_validate_file_name_backslash_in_name(self, validator):
-        """Test validation with backslashes in file name"""
+    @pytest.mark.parametrize("file_name", [
+        'folder\\file.txt',  # backslash is not reserved according to the code
+        '.txt',  # only extension
+        'filename',  # no extension
+        'my file name.txt',  # spaces in file name
+    ])
+    def test_validate_file_name_valid_edge_cases(self, validator, file_name):
+        """Test validation passes for unusual but valid file names"""
         validator.manifest_rows = [
-            {'file_name': 'folder\\file.txt', 'md5sum': 'abc123'},
+            {'file_name': file_name, 'md5sum': 'abc123'},
         ]
         validator.configs[FILE_NAME_FIELD] = 'file_name'
         validator.configs[FILE_MD5_FIELD] = 'md5sum'
-        
-        result = validator.validate_file_name()
-        
-        # Backslash is not reserved according to the code
-        assert result, "Backslash in relative path should pass"
 
-    def test_validate_file_name_only_extension(self, validator):
-        """Test validation with file that is only extension"""
-        validator.manifest_rows = [
-            {'file_name': '.txt', 'md5sum': 'abc123'},
-        ]
-        validator.configs[FILE_NAME_FIELD] = 'file_name'
-        validator.configs[FILE_MD5_FIELD] = 'md5sum'
-        
         result = validator.validate_file_name()
-        
-        assert result, "File with only extension should pass"
 
-    def test_validate_file_name_no_extension(self, validator):
-        """Test validation with file that has no extension"""
-        validator.manifest_rows = [
-            {'file_name': 'filename', 'md5sum': 'abc123'},
-        ]
-        validator.configs[FILE_NAME_FIELD] = 'file_name'
-        validator.configs[FILE_MD5_FIELD] = 'md5sum'
-        
-        result = validator.validate_file_name()
-        
-        assert result, "File without extension should pass"
+        assert result, f"File name {file_name!r} should pass"
 
-    def test_validate_file_name_space_in_name(self, validator):
-        """Test validation with spaces in file name"""
+    def test_validate_file_name_absolute_path_with_reserved_chars(self, validator):
+        """Test that an absolute path with reserved characters reports both errors"""
         validator.manifest_rows = [
-            {'file_name': 'my file name.txt', 'md5sum': 'abc123'},
+            {'file_name': '/path/to/file*.txt', 'md5sum': 'abc123'},
         ]
         validator.configs[FILE_NAME_FIELD] = 'file_name'
         validator.configs[FILE_MD5_FIELD] = 'md5sum'
-        
+
         result = validator.validate_file_name()
-        
-        assert result, "File names with spaces should pass"
+
+        assert not result
+        error_msgs = error_messages(validator)
+        assert any("no absolute path allowed" in m for m in error_msgs)
+        assert any("contains invalid characters" in m for m in error_msgs)
@@ -1,9 +1,5 @@
 #!/usr/bin/env python3
 """Unit tests for process_manifest._is_valid_file_id_value."""
-import os
-import sys
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from common.constants import DCF_PREFIX, OMIT_DCF_PREFIX
 from process_manifest import _is_valid_file_id_value
@@ -1,12 +1,7 @@
 #!/usr/bin/env python3
 """Unit tests for common.utils.clean_up_key_value function"""
-import os
-import sys
 import pytest
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from common.utils import clean_up_key_value
 
 
@@ -2,10 +2,13 @@
 
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bento.common.utils import get_logger
 # from common.constants import UPLOAD_TYPE, API_URL, SUBMISSION_ID, TOKEN
 from common.utils import get_exception_msg
 
+MAX_STS_API_WORKERS = 16
+
 class APIInvoker:
     def __init__(self, configs):
         self.log = get_logger('GraphQL API')
@@ -110,38 +113,56 @@ class APIInvoker:
 
     def get_all_data_elements_v2(self, api_uri_list):
         """
-        Retrieve data elements
-        :param api_uri: api uri
-        :return: data elements
+        Retrieve data elements from multiple api uris concurrently
+        :param api_uri_list: list of api uris
+        :return: list of data elements per api uri, in the order the api responds, None if failed
         """
-        headers = {
-            "accept": "application/json"
-        }
         try:
-            # response = requests.get(api_uri, headers=headers)
-            results_list = []
-            for api_uri in api_uri_list:
-                response = requests.get(api_uri, headers=headers, verify=False)
-                status = response.status_code
-                # self.log.info(f"get_data_element_by_cde_code response status code: {status}.")
-                if status == 200:
-                    results = response.json()
-                    if isinstance(results, dict) and "errors" in results:
-                        self.log.error(f'Retrieve data element by cde code failed - {results.get("errors")[0].get("message")}.')
-                        return None
-                    else:
-                        results_list.append(results)
-                else:
-                    self.log.error(f'Retrieve data element by cde code failed (code: {status}) - internal error. Please try again and contact the helpdesk if this error persists.')
-                    #return None
-                    results_list.append(None)
-            return results_list
+            return list(self.iter_data_elements_v2(api_uri_list))
 
         except Exception as e:
             self.log.debug(e)
             self.log.exception(f'Retrieve data element by cde code failed - internal error. Please try again and contact the helpdesk if this error persists.')
             return None
-        
+
+    def iter_data_elements_v2(self, api_uri_list):
+        """
+        Retrieve data elements from multiple api uris concurrently, caller needs handle exception.
+        :param api_uri_list: list of api uris
+        :return: generator of data elements per api uri (None if not retrieved), in the order the api responds
+        """
+        if not api_uri_list:
+            return
+        with ThreadPoolExecutor(max_workers=min(MAX_STS_API_WORKERS, len(api_uri_list))) as executor:
+            futures = {executor.submit(self._get_data_elements_v2, api_uri): api_uri for api_uri in api_uri_list}
+            for future in as_completed(futures):
+                # drop the completed future, so its data elements are freed once the caller is done with them
+                api_uri = futures.pop(future)
+                is_valid, results = future.result()
+                if not is_valid:
+                    raise Exception(f"Retrieve data elements from {api_uri} failed.")
+                yield results
+
+    def _get_data_elements_v2(self, api_uri):
+        """
+        Retrieve data elements from one api uri
+        :param api_uri: api uri
+        :return: (False, None) if api returns errors, otherwise (True, data elements or None)
+        """
+        headers = {
+            "accept": "application/json"
+        }
+        response = requests.get(api_uri, headers=headers, verify=False)
+        status = response.status_code
+        if status == 200:
+            results = response.json()
+            if isinstance(results, dict) and "errors" in results:
+                self.log.error(f'Retrieve data element by cde code failed - {results.get("errors")[0].get("message")}.')
+                return False, None
+            return True, results
+        self.log.error(f'Retrieve data element by cde code failed (code: {status}) - internal error. Please try again and contact the helpdesk if this error persists.')
+        return True, None
+
     def list_github_files(self, url, branch, token=None):
         headers = {}
         if token:
@@ -13,8 +13,8 @@ from common.constants import BATCH_COLLECTION, SUBMISSION_COLLECTION, DATA_COLLE
     GENERATED_PROPS, FILE_ENDED, METADATA_ENDED, METADATA_STATUS, FILE_STATUS, FILE_VALIDATION, METADATA_VALIDATION, \
     CONSENT_CODE, RELEASE, VERSION, PROPERTY, MODEL, \
     COMPLETED_BATCHES, FAILED_BATCHES, BATCH_STATUS_DETAILS, WORST_BATCH_STATUS, STATUS_DETAIL, \
-    STATUS_PRECEDENCE, PRECEDENCE_TO_STATUS
-from common.utils import get_exception_msg, current_datetime, get_uuid_str
+    STATUS_PRECEDENCE, PRECEDENCE_TO_STATUS, PROPERTY_PV_FINGERPRINT
+from common.utils import get_exception_msg, current_datetime, get_uuid_str, get_dict_fingerprint
 from common.s3_utils import S3Service
 
 MAX_SIZE = 10000
@@ -1190,23 +1190,20 @@ class MongoDao:
     def upsert_property_pv(self, prop_list):
         db = self.client[self.db_name]
         data_collection = db["propertyPVs"]
-        commands = []
         try:
-            for m in list(prop_list):
-                query = {PROPERTY: m[PROPERTY], VERSION: m[VERSION], MODEL: m[MODEL]}
-                property = data_collection.find_one(query)
-                if property:
-                    property[UPDATED_AT] = current_datetime()
-                    property[PROPERTY_PERMISSIBLE_VALUES] = m[PROPERTY_PERMISSIBLE_VALUES]
-                    commands.append(UpdateOne({ID: property[ID]}, {"$set": property}))
-                else:
-                    m[CREATED_AT] = current_datetime()
-                    m[UPDATED_AT] = current_datetime()
-                    m[ID] = get_uuid_str()
-                    commands.append(InsertOne(m))
-            if len(commands) > 0:
-                result = data_collection.bulk_write(commands)
-            self.log.info(f'Total {result.inserted_count} property PV are inserted and {result.modified_count} property PV are updated.')
+            current_time = current_datetime()
+            prop_list = list(prop_list)
+            # skip records unchanged since the last pull, i.e. the fingerprint saved with the property PV matches
+            fingerprints = self.get_fingerprints((m[PROPERTY], m[MODEL], m[VERSION]) for m in prop_list)
+            # records may be any mapping, e.g. PropertyRecord, they are converted to documents here
+            docs = []
+            for m in prop_list:
+                fingerprint = get_dict_fingerprint(m)
+                if fingerprints.get((m[PROPERTY], m[MODEL], m[VERSION])) == fingerprint:
+                    continue
+                docs.append({**m, PROPERTY_PV_FINGERPRINT: fingerprint, CREATED_AT: current_time, UPDATED_AT: current_time})
+            inserted_count, updated_count = self.bulk_upsert_many(data_collection, docs, [PROPERTY, VERSION, MODEL], [PROPERTY_PERMISSIBLE_VALUES, PROPERTY_PV_FINGERPRINT, UPDATED_AT])
+            self.log.info(f'Total {inserted_count} property PV are inserted, {updated_count} property PV are updated and {len(prop_list) - len(docs)} property PV are unchanged.')
             return True, None
         except errors.PyMongoError as pe:
             self.log.exception(pe)
@@ -1219,6 +1216,68 @@ class MongoDao:
             self.log.exception(msg)
             return False, msg
 
+    """
+    get fingerprints saved with property PVs
+    :param keys: iterable of (property, model, version)
+    :return: dict of (property, model, version) to fingerprint, empty if failed
+    """
+    def get_fingerprints(self, keys):
+        keys = set(keys)
+        if not keys:
+            return {}
+        db = self.client[self.db_name]
+        data_collection = db["propertyPVs"]
+        query = {PROPERTY: {"$in": list({key[0] for key in keys})}, MODEL: {"$in": list({key[1] for key in keys})},
+                 VERSION: {"$in": list({key[2] for key in keys})}, PROPERTY_PV_FINGERPRINT: {"$exists": True}}
+        projection = {PROPERTY: 1, MODEL: 1, VERSION: 1, PROPERTY_PV_FINGERPRINT: 1}
+        try:
+            fingerprints = {}
+            for doc in data_collection.find(query, projection):
+                key = (doc.get(PROPERTY), doc.get(MODEL), doc.get(VERSION))
+                if key in keys:
+                    fingerprints[key] = doc.get(PROPERTY_PV_FINGERPRINT)
+            return fingerprints
+        except errors.PyMongoError as pe:
+            self.log.exception(pe)
+            self.log.exception(f"Failed to get property PV fingerprints: {get_exception_msg()}")
+            return {}
+        except Exception as e:
+            self.log.exception(e)
+            self.log.exception(f"Failed to get property PV fingerprints: {get_exception_msg()}")
+            return {}
+
+    """
+    upsert documents in unordered bulk writes of up to MAX_SIZE documents, matching existing documents by key fields.
+    Fields in update_fields are set on every write, the rest of the document and a new ID only on insert.
+    Docs are consumed lazily, so a generator is streamed to the server batch by batch.
+    Caller needs handle exception.
+    :param data_collection
+    :param docs: iterable of dictionary
+    :param key_fields: list of field names identifying a document
+    :param update_fields: list of field names updated on existing documents
+    :return: (inserted count, updated count)
+    """
+    def bulk_upsert_many(self, data_collection, docs, key_fields, update_fields=None):
+        update_fields = update_fields or []
+        inserted_count = updated_count = 0
+        commands = []
+        for doc in docs:
+            query = {key: doc[key] for key in key_fields}
+            update = {"$setOnInsert": {ID: get_uuid_str(), **{k: v for k, v in doc.items() if k not in update_fields}}}
+            if update_fields:
+                update["$set"] = {key: doc[key] for key in update_fields}
+            commands.append(UpdateOne(query, update, upsert=True))
+            if len(commands) >= MAX_SIZE:
+                result = data_collection.bulk_write(commands, ordered=False)
+                inserted_count += result.upserted_count
+                updated_count += result.modified_count
+                commands = []
+        if len(commands) > 0:
+            result = data_collection.bulk_write(commands, ordered=False)
+            inserted_count += result.upserted_count
+            updated_count += result.modified_count
+        return inserted_count, updated_count
+
     def upsert_cde(self, cde_list):
         db = self.client[self.db_name]
         data_collection = db[CDE_COLLECTION]
@@ -1447,20 +1506,11 @@ class MongoDao:
     def insert_synonyms(self, synonym_list):
         db = self.client[self.db_name]
         data_collection = db[SYNONYM_COLLECTION]
-        to_insert = []
         try:
-            for item in synonym_list:
-                synonym = {SYNONYM_TERM: item[0], PV_TERM: item[1]}
-                # check if synonym exists
-                existing_synonym = data_collection.find_one(synonym)
-                if existing_synonym:
-                    continue
-                to_insert.append({ID: get_uuid_str(),  **synonym})
-
-            if len(to_insert) == 0:
-                return 0
-            result = data_collection.insert_many(to_insert)
-            return len(result.inserted_ids)
+            # only insert synonyms not existing yet
+            docs = ({SYNONYM_TERM: item[0], PV_TERM: item[1]} for item in synonym_list)
+            inserted_count, _ = self.bulk_upsert_many(data_collection, docs, [SYNONYM_TERM, PV_TERM])
+            return inserted_count
         except errors.PyMongoError as pe:
             self.log.exception(pe)
             msg = f"Failed to upsert synonyms ."
@@ -1507,20 +1557,11 @@ class MongoDao:
     def insert_concept_codes_v2(self, concept_codes):
         db = self.client[self.db_name]
         data_collection = db[PV_CONCEPT_CODE_COLLECTION]
-        to_insert = []
         try:
-            for item in concept_codes:
-                concept_code = {MODEL: item[0], PROPERTY: item[1], PERMISSIBLE_VALUE: item[2], CONCEPT_CODE: item[3]}
-                # check if synonym exists
-                existing_concept_code = data_collection.find_one(concept_code)
-                if existing_concept_code:
-                    continue
-                to_insert.append({ID: get_uuid_str(),  **concept_code})
-
-            if len(to_insert) == 0:
-                return 0
-            result = data_collection.insert_many(to_insert)
-            return len(result.inserted_ids)
+            # only insert concept codes not existing yet
+            docs = ({MODEL: item[0], PROPERTY: item[1], PERMISSIBLE_VALUE: item[2], CONCEPT_CODE: item[3]} for item in concept_codes)
+            inserted_count, _ = self.bulk_upsert_many(data_collection, docs, [MODEL, PROPERTY, PERMISSIBLE_VALUE, CONCEPT_CODE])
+            return inserted_count
         except errors.PyMongoError as pe:
             self.log.exception(pe)
             msg = f"Failed to upsert concept code, {get_exception_msg()}"
@@ -12,6 +12,7 @@ import numpy as np
 from bento.common.utils import get_stream_md5
 from datetime import datetime
 import uuid
+import hashlib
 from common.constants import QC_SEVERITY, LAST_MODIFIED, PROPERTY_PERMISSIBLE_VALUES
 
 VALIDATION_MESSAGE_CONFIG_FILE = "configs/messages_configuration.yml"
@@ -154,6 +155,12 @@ get uuid v4
 def get_uuid_str():
     return str(uuid.uuid4())
 
+"""
+get sha1 fingerprint of a dict, independent of key order
+"""
+def get_dict_fingerprint(obj):
+    return hashlib.sha1(json.dumps(dict(obj), sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
     
 """
 get s3 file size and last modified
@@ -4,6 +4,10 @@ from common.constants import STS_API_ALL_URL_V2, STS_API_ONE_URL_V2, \
         PROPERTY_PERMISSIBLE_VALUES, STS_DATA_RESOURCE_CONFIG, STS_DATA_RESOURCE_API, DATA_COMMONS_LIST, HIDDEN_MODELS, KEY, PROPERTY, MODEL, VERSION
 from common.utils import get_exception_msg
 from common.api_client import APIInvoker
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from collections.abc import Mapping
+import functools
 import re
 
 MODEL_DEFS = "models"
@@ -18,6 +22,35 @@ PROPERTY_PV_NAME = "permissibleValues"
 NCIT_PROPERTY_CONCEPT_CODE = "ncit_concept_code"
 NCIT_SYNONYMS = "synonyms"
 NCIT_VALUE = "value"
+_VERSION_RE = re.compile(r'[\d.]+')
+
+class PropertyRecord(Mapping):
+    """
+    Read-only property PV record with slots, a full CDE pull keeps all of them in memory.
+    It is accessed like the propertyPVs document, e.g. record[PROPERTY], and dict(record) gives the document.
+    """
+    __slots__ = ("property", "model", "version", "permissible_values")
+    _KEYS = {PROPERTY: "property", MODEL: "model", VERSION: "version", PROPERTY_PERMISSIBLE_VALUES: "permissible_values"}
+
+    def __init__(self, property, model, version, permissible_values):
+        self.property = property
+        self.model = model
+        self.version = version
+        self.permissible_values = permissible_values
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, self._KEYS[key])
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return f"PropertyRecord({dict(self)})"
 
 def pull_pv_lists_v2(configs, mongo_dao):
     """
@@ -27,6 +60,9 @@ def pull_pv_lists_v2(configs, mongo_dao):
     :param mongo_dao: Data access object for MongoDB operations.
     """
     log = get_logger('Permissive values and synonym puller')
+    if not _get_pv_models(mongo_dao):
+        log.info("No models configured, skip pulling permissive values.")
+        return
     api_client = APIInvoker(configs)
     pv_puller = PVPullerV2(configs, mongo_dao, api_client)
     # synonym_puller = SynonymPuller(configs, mongo_dao, api_client)
@@ -40,6 +76,18 @@ def pull_pv_lists_v2(configs, mongo_dao):
         log.critical(e)
         log.critical(
             f'Something wrong happened while pulling permissive values! Check debug log for details.')
+@functools.lru_cache(maxsize=1)
+def _get_pv_models(mongo_dao):
+    """
+    get models to pull property PVs for, i.e. configured data commons which are not hidden.
+    Cached per mongo_dao so the configuration is read once per process.
+    :return: tuple of model names
+    """
+    config_model_list = mongo_dao.get_configuration_by_ev_var([DATA_COMMONS_LIST, HIDDEN_MODELS])
+    if config_model_list is not None and len(config_model_list) == 2: #if both data commons list and hidden models are configured
+        return tuple(x for x in config_model_list[0][KEY] if x not in config_model_list[1][KEY])
+    return ()
+
 class PVPullerV2:
     """
     Class for pulling permissible values from STS and saving them to the database.
@@ -49,14 +97,7 @@ class PVPullerV2:
         self.mongo_dao = mongo_dao
         self.configs = configs
         self.api_client = api_client
-        self.config_model_list = self.mongo_dao.get_configuration_by_ev_var([DATA_COMMONS_LIST, HIDDEN_MODELS])
-        if self.config_model_list is not None:
-            if len(self.config_model_list) == 2: #if both data commons list and hidden models are configured
-                self.pv_models = [x for x in self.config_model_list[0][KEY] if x not in self.config_model_list[1][KEY]]
-            else:
-                self.pv_models = []
-        else:
-            self.pv_models = []
+        self.pv_models = list(_get_pv_models(mongo_dao))
         
     def pull_property_pv_synonym_concept_codes(self):
         """
@@ -70,26 +111,31 @@ class PVPullerV2:
                 self.log.info("No property found!")
                 return
             self.log.info(f"{len(property_records)} unique property are retrieved!")
-            result, msg = self.mongo_dao.upsert_property_pv(list(property_records))
+            if synonym_records:
+                self.log.info(f"{count_records(synonym_records)} unique synonyms are retrieved!")
+            if concept_codes_records:
+                self.log.info(f"{count_records(concept_codes_records)} unique concept codes are retrieved!")
+            # property PVs, synonyms and concept codes are saved in different collections, write them concurrently
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                pv_future = executor.submit(self.mongo_dao.upsert_property_pv, list(property_records))
+                synonym_future = executor.submit(self.mongo_dao.insert_synonyms, iter_synonym_records(synonym_records)) if synonym_records else None
+                concept_code_future = executor.submit(self.mongo_dao.insert_concept_codes_v2, iter_concept_code_records(concept_codes_records)) if concept_codes_records else None
+
+            result, msg = pv_future.result()
             if result: 
                 self.log.info(f"Property PV are pulled and save successfully!")
             else:
                 self.log.error(f"Failed to pull and save Property PV! {msg}")
 
-            if not synonym_records or len(synonym_records) == 0:
+            if not synonym_future:
                 self.log.info("No synonym found!")
-                return
-            self.log.info(f"{len(synonym_records)} unique synonyms are retrieved!")
-            result = self.mongo_dao.insert_synonyms(list(synonym_records))
-            if result is not None:
+            elif synonym_future.result() is not None:
                 self.log.info(f"Property Synonyms are pulled and save successfully!")
 
-            if not concept_codes_records or len(concept_codes_records) == 0:
+            if not concept_code_future:
                 self.log.info("No concept code found!")
                 return
-            self.log.info(f"{len(concept_codes_records)} unique concept codes are retrieved!")
-            result = self.mongo_dao.insert_concept_codes_v2(list(concept_codes_records))
-            if result is not None:
+            if concept_code_future.result() is not None:
                 self.log.info(f"Property Concept Codes are pulled and save successfully!")
             self.log.info(f"All property PVs, Synonyms and Concept Codes are pulled and saved successfully!")
             return
@@ -110,17 +156,18 @@ def retrieveAllPropertyViaAPI(configs, pv_models, log, api_client=None):
     log.info(f"Retrieving property from {sts_api_url_list}...")
     if not api_client:
         api_client = APIInvoker(configs)
-    results_list = api_client.get_all_data_elements_v2(sts_api_url_list)
-    results = []
-    for result in results_list:
-        if result is not None:
-            results.extend(result)
-    if not results or len(results) == 0:
+    property_records = {} # (property, model, version) -> property record
+    synonym_map = defaultdict(set) # value -> synonyms
+    concept_code_map = defaultdict(set) # (model, property) -> (value, concept code)
+    # fold each model's results into the records as soon as it is retrieved
+    for results in api_client.iter_data_elements_v2(sts_api_url_list):
+        if results:
+            process_sts_property_pv_chunk(results, property_records, synonym_map, concept_code_map)
+    if not property_records:
         log.error(f"No property/pvs retrieve from STS API, {sts_api_url_list}.")
         return None, None, None
-    property_records, synonym_set, concept_code_set = process_sts_property_pv(results, log)
     log.info(f"Retrieved property PVs from {sts_api_url_list}.")
-    return property_records, synonym_set, concept_code_set
+    return list(property_records.values()), synonym_map, concept_code_map
 
 
 def process_sts_property_pv(sts_results, log, property_only=False):
@@ -128,105 +175,129 @@ def process_sts_property_pv(sts_results, log, property_only=False):
     get property pv from sts api
     :param sts_api_url: sts api url
     """
-    property_set = set()
-    property_records = []
-    synonym_set = set()
-    concept_code_set = set()
+    property_records = {} # (property, model, version) -> property record
+    synonym_map = defaultdict(set) # value -> synonyms
+    concept_code_map = defaultdict(set) # (model, property) -> (value, concept code)
     if not sts_results or len(sts_results) == 0:
         log.error(f"No property/pvs retrieve from STS API.")
         return None, None, None
-    property_list  = [item for item in sts_results if item.get(PROPERTY) and item.get(PROPERTY) != 'null'] 
-    if not property_list or len(property_list) == 0:
+    process_sts_property_pv_chunk(sts_results, property_records, synonym_map, concept_code_map, property_only)
+    if not property_records:
         log.error(f"No property found in STS API results.")
         return None, None, None
-    for item in property_list:
-        property_name = item.get(PROPERTY)
-        model = item.get(MODEL) if item.get(MODEL) and item.get(MODEL) != 'null' else None
-        version = item.get(VERSION) if item.get(VERSION) and item.get(VERSION) != 'null' else None
-        version = re.match(r'[\d.]+', version).group()
+    return list(property_records.values()), synonym_map, concept_code_map
+
+def process_sts_property_pv_chunk(sts_results, property_records, synonym_map, concept_code_map, property_only=False):
+    """
+    add property pv, synonyms and concept codes of sts api results to the given records
+    :param sts_results: sts api results
+    :param property_records: dict of (property, model, version) -> property record
+    :param synonym_map: defaultdict of value -> set of synonyms
+    :param concept_code_map: defaultdict of (model, property) -> set of (value, concept code)
+    """
+    # bind the field names locally, they are read for every item and pv below
+    property_name_key, model_key, version_key = PROPERTY, MODEL, VERSION
+    pv_name, value_name = PROPERTY_PV_NAME, NCIT_VALUE
+    synonyms_name, concept_code_name = NCIT_SYNONYMS, NCIT_PROPERTY_CONCEPT_CODE
+    for item in sts_results:
+        property_name = item.get(property_name_key)
+        if not property_name or property_name == 'null':
+            continue
+        raw_model = item.get(model_key)
+        model = raw_model if raw_model and raw_model != 'null' else None
+        version = _norm_version(item.get(version_key))
         property_key = (property_name, model, version)
-        if property_key in property_set:
+        if property_key in property_records:
             continue
-        property_set.add(property_key)
-        property_record = compose_property_record(item)
-        property_records.append(property_record)
+        property_records[property_key] = compose_property_record(item, version)
         if property_only:
             continue
-        # extract synonyms
-        if item.get(PROPERTY_PV_NAME) and len(item.get(PROPERTY_PV_NAME)) > 0 and item.get(PROPERTY_PV_NAME)[0].get(NCIT_SYNONYMS):
-            compose_synonym_record(item, synonym_set)
-
-        # extract concept codes
-        if item.get(PROPERTY_PV_NAME) and len(item.get(PROPERTY_PV_NAME)) > 0 and item.get(PROPERTY_PV_NAME)[0].get(NCIT_PROPERTY_CONCEPT_CODE):
-            compose_concept_code_record(item, concept_code_set)
-
-    return property_records, synonym_set, concept_code_set
+        pv_list = item.get(pv_name)
+        if not pv_list:
+            continue
+        # synonyms and concept codes are only extracted if the first pv carries them
+        with_synonyms = bool(pv_list[0].get(synonyms_name))
+        with_concept_codes = bool(pv_list[0].get(concept_code_name))
+        if not with_synonyms and not with_concept_codes:
+            continue
+        concept_codes = concept_code_map[(raw_model, property_name)] if with_concept_codes else None
+        # extract synonyms and concept codes in a single pass over the pv list
+        for pv in pv_list:
+            value = pv.get(value_name)
+            if with_synonyms:
+                synonyms = pv.get(synonyms_name)
+                if synonyms:
+                    for synonym in synonyms:
+                        if not synonym:
+                            continue
+                        term = str(synonym).strip().lower()
+                        if term:
+                            synonym_map[value].add(term)
+            if with_concept_codes:
+                concept_code = pv.get(concept_code_name)
+                if concept_code:
+                    concept_codes.add((value, concept_code))
 
 def extract_pv_list(property_pv_list):
     """
     extract pv list from property pv list
     """
-    pv_list = []
     if property_pv_list is None:
-        pv_list = None
-    if property_pv_list and any(item.get(NCIT_VALUE) for item in property_pv_list):
-        pv_list = [item[NCIT_VALUE] for item in property_pv_list if NCIT_VALUE in item and item[NCIT_VALUE] is not None]
+        return None
+    pv_list = []
+    has_value = False
+    for item in property_pv_list:
+        value = item.get(NCIT_VALUE)
+        if value is None:
+            continue
+        if value:
+            has_value = True
         # strip white space if the value is a string
-        if pv_list and isinstance(pv_list[0], str): 
-            pv_list = [item.strip() for item in pv_list]
-    
-    return pv_list
+        pv_list.append(value.strip() if isinstance(value, str) else value)
+    # no pv list if none of the values is set
+    return pv_list if has_value else []
+
+def _norm_version(version):
+    """
+    normalize STS version string to its leading numeric part, None if absent
+    """
+    if not version or version == 'null':
+        return None
+    return _VERSION_RE.match(version).group()
 
-def compose_property_record(property_item):
+def compose_property_record(property_item, version=None):
     """
     compose property record from property item
+    :param version: normalized version, computed from property item if not given
     """
-    property_record = {
-        PROPERTY: property_item.get(PROPERTY),
-        MODEL: property_item.get(MODEL),
-        VERSION: re.match(r'[\d.]+', property_item.get(VERSION)).group() if property_item.get(VERSION) and property_item.get(VERSION) != 'null' else None,
-        PROPERTY_PERMISSIBLE_VALUES: extract_pv_list(property_item.get(PROPERTY_PV_NAME))
-    }
-    return property_record
+    return PropertyRecord(
+        property_item.get(PROPERTY),
+        property_item.get(MODEL),
+        version if version is not None else _norm_version(property_item.get(VERSION)),
+        extract_pv_list(property_item.get(PROPERTY_PV_NAME))
+    )
 
-def compose_synonym_record(property_item, synonym_set):
+def iter_synonym_records(synonym_map):
     """
-    compose synonym record from property item
-    Synonym terms are normalized to lowercase before deduplication and DB insert.
+    flatten synonym map to (synonym, value) records
     """
-    pv_list = property_item.get(PROPERTY_PV_NAME)
-    if pv_list:
-        for pv_item in pv_list:
-            synonyms = pv_item.get(NCIT_SYNONYMS)
-            if synonyms:
-                for synonym in synonyms:
-                        if synonym:
-                            term = str(synonym).strip().lower()
-                            if not term:
-                                continue
-                            synonym_key = (term, pv_item.get(NCIT_VALUE))
-                            if synonym_key in synonym_set:
-                                continue
-                            synonym_set.add(synonym_key)
-    return
+    for value, synonyms in synonym_map.items():
+        for synonym in synonyms:
+            yield synonym, value
 
-def compose_concept_code_record(property_item, concept_code_set):
+def iter_concept_code_records(concept_code_map):
     """
-    compose concept code record from property item
+    flatten concept code map to (model, property, value, concept code) records
     """
-    pv_list = property_item.get(PROPERTY_PV_NAME)
-    model = property_item.get(MODEL)
-    property_name = property_item.get(PROPERTY)
-    if pv_list:
-        for pv in pv_list:
-            value = pv.get(NCIT_VALUE)
-            concept_code = pv.get(NCIT_PROPERTY_CONCEPT_CODE)
-            if concept_code:
-                concept_code_key = (model, property_name, value, concept_code)
-                if concept_code_key in concept_code_set:
-                    continue
-                concept_code_set.add(concept_code_key)
-    return
+    for (model, property_name), concept_codes in concept_code_map.items():
+        for value, concept_code in concept_codes:
+            yield model, property_name, value, concept_code
+
+def count_records(record_map):
+    """
+    count records of a synonym or concept code map
+    """
+    return sum(len(records) for records in record_map.values())
 
 def get_pv_by_property_version(configs, log, prop, prop_version, prop_model, mongo_dao):
     """
@@ -312,15 +383,15 @@ def get_all_pvs_by_version(configs, log, version, model, mongo_dao):
 
     if not synonym_records or len(synonym_records) == 0:
         log.info("No synonym found!")
-    log.info(f"{len(synonym_records)} unique synonyms are retrieved!")
-    result_synonyms = mongo_dao.insert_synonyms(list(synonym_records))
+    log.info(f"{count_records(synonym_records)} unique synonyms are retrieved!")
+    result_synonyms = mongo_dao.insert_synonyms(iter_synonym_records(synonym_records))
     if result_synonyms is not None:
         log.info(f"Property Synonyms for {model}/{version} are pulled and save successfully!")
 
     if not concept_codes_records or len(concept_codes_records) == 0:
         log.info("No concept code found!")
-    log.info(f"{len(concept_codes_records)} unique concept codes are retrieved!")
-    result_concept_codes = mongo_dao.insert_concept_codes_v2(list(concept_codes_records))
+    log.info(f"{count_records(concept_codes_records)} unique concept codes are retrieved!")
+    result_concept_codes = mongo_dao.insert_concept_codes_v2(iter_concept_code_records(concept_codes_records))
     if result_concept_codes is not None:
         log.info(f"Property Concept Codes for {model}/{version} are pulled and save successfully!")
     log.info(f"All property PVs, Synonyms and Concept Codes for {model}/{version} are pulled and saved successfully!")
@@ -0,0 +1,74 @@
+import gc
+import weakref
+import pytest
+from unittest.mock import MagicMock, patch
+from common.api_client import APIInvoker
+
+
+class _DataElements(list):
+    """list of data elements which can be weakly referenced"""
+
+
+def _response(status_code=200, payload=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+@pytest.fixture
+def api_client():
+    with patch("common.api_client.get_logger"):
+        yield APIInvoker({})
+
+
+@patch("common.api_client.requests.get")
+def test_iter_data_elements_v2_empty_uri_list(mock_get, api_client):
+    assert list(api_client.iter_data_elements_v2([])) == []
+    mock_get.assert_not_called()
+
+
+@patch("common.api_client.requests.get")
+def test_iter_data_elements_v2_non_200_yields_none(mock_get, api_client):
+    mock_get.return_value = _response(status_code=500)
+
+    assert list(api_client.iter_data_elements_v2(["http://sts/model1"])) == [None]
+
+
+@patch("common.api_client.requests.get")
+def test_iter_data_elements_v2_errors_payload_raises(mock_get, api_client):
+    mock_get.return_value = _response(payload={"errors": [{"message": "bad model"}]})
+
+    with pytest.raises(Exception) as exc_info:
+        list(api_client.iter_data_elements_v2(["http://sts/model1"]))
+
+    assert "http://sts/model1" in str(exc_info.value)
+
+
+@patch("common.api_client.requests.get")
+def test_iter_data_elements_v2_releases_consumed_results(mock_get, api_client):
+    mock_get.side_effect = lambda api_uri, **kwargs: _response(payload=_DataElements([{"property": api_uri}]))
+    refs = []
+
+    for results in api_client.iter_data_elements_v2([f"http://sts/model{i}" for i in range(3)]):
+        refs.append(weakref.ref(results))
+        del results
+        gc.collect()
+        # only the results just yielded may still be held by the generator
+        assert sum(ref() is not None for ref in refs[:-1]) == 0
+
+    assert len(refs) == 3
+
+
+@patch("common.api_client.requests.get")
+def test_get_all_data_elements_v2(mock_get, api_client):
+    mock_get.return_value = _response(payload=[{"property": "prop1"}])
+
+    assert api_client.get_all_data_elements_v2(["http://sts/model1"]) == [[{"property": "prop1"}]]
+
+
+@patch("common.api_client.requests.get")
+def test_get_all_data_elements_v2_errors_payload_returns_none(mock_get, api_client):
+    mock_get.return_value = _response(payload={"errors": [{"message": "bad model"}]})
+
+    assert api_client.get_all_data_elements_v2(["http://sts/model1", "http://sts/model2"]) is None
@@ -0,0 +1,117 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from common.mongo_dao import MongoDao
+from common.constants import ID, PROPERTY, MODEL, VERSION, PROPERTY_PERMISSIBLE_VALUES, UPDATED_AT, \
+    SYNONYM_TERM, PV_TERM, PROPERTY_PV_FINGERPRINT
+from common.utils import get_dict_fingerprint
+from pymongo import errors
+
+
+@pytest.fixture
+def dao():
+    with patch("common.mongo_dao.MongoClient"):
+        yield MongoDao("mongodb://localhost:27017", "test_db")
+
+
+@patch("common.mongo_dao.UpdateOne")
+def test_bulk_upsert_many_builds_unordered_upserts(mock_update_one, dao):
+    collection = MagicMock()
+    docs = [{SYNONYM_TERM: "syn1", PV_TERM: "val1"}, {SYNONYM_TERM: "syn2", PV_TERM: "val2"}]
+
+    dao.bulk_upsert_many(collection, iter(docs), [SYNONYM_TERM, PV_TERM])
+
+    commands = collection.bulk_write.call_args[0][0]
+    assert collection.bulk_write.call_args[1] == {"ordered": False}
+    assert len(commands) == 2
+    query, update = mock_update_one.call_args_list[0][0]
+    assert query == {SYNONYM_TERM: "syn1", PV_TERM: "val1"}
+    assert mock_update_one.call_args_list[0][1] == {"upsert": True}
+    assert set(update.keys()) == {"$setOnInsert"}
+    assert update["$setOnInsert"][ID]
+
+
+@patch("common.mongo_dao.UpdateOne")
+def test_bulk_upsert_many_sets_update_fields(mock_update_one, dao):
+    collection = MagicMock()
+    doc = {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["a"], UPDATED_AT: "now"}
+
+    dao.bulk_upsert_many(collection, [doc], [PROPERTY, VERSION, MODEL], [PROPERTY_PERMISSIBLE_VALUES, UPDATED_AT])
+
+    update = mock_update_one.call_args[0][1]
+    assert update["$set"] == {PROPERTY_PERMISSIBLE_VALUES: ["a"], UPDATED_AT: "now"}
+    assert PROPERTY_PERMISSIBLE_VALUES not in update["$setOnInsert"]
+    assert update["$setOnInsert"][PROPERTY] == "prop1"
+
+
+def test_bulk_upsert_many_empty(dao):
+    collection = MagicMock()
+
+    assert dao.bulk_upsert_many(collection, [], [SYNONYM_TERM]) == (0, 0)
+    collection.bulk_write.assert_not_called()
+
+
+def test_bulk_upsert_many_writes_in_batches(dao):
+    collection = MagicMock()
+    collection.bulk_write.return_value = MagicMock(upserted_count=2, modified_count=1)
+    docs = ({SYNONYM_TERM: f"syn{i}", PV_TERM: "val"} for i in range(5))
+
+    with patch("common.mongo_dao.MAX_SIZE", 2):
+        result = dao.bulk_upsert_many(collection, docs, [SYNONYM_TERM, PV_TERM])
+
+    assert [len(c[0][0]) for c in collection.bulk_write.call_args_list] == [2, 2, 1]
+    assert result == (6, 3)
+
+
+def test_insert_synonyms_returns_upserted_count(dao):
+    collection = dao.client["test_db"]["synonyms"]
+    collection.bulk_write.return_value = MagicMock(upserted_count=1)
+
+    assert dao.insert_synonyms([("syn1", "val1"), ("syn2", "val2")]) == 1
+    collection.find_one.assert_not_called()
+
+
+def test_upsert_property_pv_failure(dao):
+    collection = dao.client["test_db"]["propertyPVs"]
+    collection.bulk_write.side_effect = errors.PyMongoError("write failed")
+
+    result, msg = dao.upsert_property_pv([{PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: []}])
+
+    assert result is False
+    assert msg
+
+
+@patch("common.mongo_dao.UpdateOne")
+def test_upsert_property_pv_skips_unchanged(mock_update_one, dao):
+    collection = dao.client["test_db"]["propertyPVs"]
+    unchanged = {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["a"]}
+    changed = {PROPERTY: "prop2", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["b"]}
+    collection.find.return_value = [
+        {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PV_FINGERPRINT: get_dict_fingerprint(unchanged)},
+        {PROPERTY: "prop2", MODEL: "model1", VERSION: "1.0", PROPERTY_PV_FINGERPRINT: "stale"},
+    ]
+    collection.bulk_write.return_value = MagicMock(upserted_count=0, modified_count=1)
+
+    result, _ = dao.upsert_property_pv([unchanged, changed])
+
+    assert result is True
+    assert len(collection.bulk_write.call_args[0][0]) == 1
+    query, update = mock_update_one.call_args[0]
+    assert query == {PROPERTY: "prop2", VERSION: "1.0", MODEL: "model1"}
+    assert update["$set"][PROPERTY_PV_FINGERPRINT] == get_dict_fingerprint(changed)
+
+
+def test_upsert_property_pv_single_record_queries_its_property(dao):
+    collection = dao.client["test_db"]["propertyPVs"]
+    record = {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["a"]}
+    collection.find.return_value = [
+        {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PV_FINGERPRINT: get_dict_fingerprint(record)},
+    ]
+
+    result, _ = dao.upsert_property_pv([record])
+
+    assert result is True
+    query = collection.find.call_args[0][0]
+    assert query[PROPERTY] == {"$in": ["prop1"]}
+    assert query[MODEL] == {"$in": ["model1"]}
+    assert query[VERSION] == {"$in": ["1.0"]}
+    collection.bulk_write.assert_not_called()
@@ -1,4 +1,5 @@
 import pytest
+from collections import defaultdict
 from unittest.mock import MagicMock, patch, call
 from pv_puller_v2 import (
     PVPullerV2, 
@@ -7,8 +8,10 @@ from pv_puller_v2 import (
     process_sts_property_pv,
     extract_pv_list,
     compose_property_record,
-    compose_synonym_record,
-    compose_concept_code_record,
+    process_sts_property_pv_chunk,
+    iter_synonym_records,
+    iter_concept_code_records,
+    count_records,
     get_pv_by_property_version,
     get_all_pvs_by_version
 )
@@ -102,6 +105,18 @@ def test_pv_puller_v2_init_only_one_config(mock_get_logger, mock_api_client, moc
     assert puller.pv_models == []
 
 
+@patch('pv_puller_v2.get_logger')
+def test_pv_puller_v2_init_caches_pv_models(mock_get_logger, mock_mongo_dao, mock_api_client, mock_configs):
+    """Test the model configuration is read once for the same mongo dao"""
+    mock_get_logger.return_value = MagicMock()
+    
+    first = PVPullerV2(mock_configs, mock_mongo_dao, mock_api_client)
+    second = PVPullerV2(mock_configs, mock_mongo_dao, mock_api_client)
+    
+    assert first.pv_models == second.pv_models == ["model1", "model2"]
+    mock_mongo_dao.get_configuration_by_ev_var.assert_called_once()
+
+
 @patch('pv_puller_v2.retrieveAllPropertyViaAPI')
 @patch('pv_puller_v2.get_logger')
 def test_pull_property_pv_synonym_concept_codes_success(
@@ -120,8 +135,8 @@ def test_pull_property_pv_synonym_concept_codes_success(
         {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val1", "val2"]},
         {PROPERTY: "prop2", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val3"]}
     ]
-    synonym_records = {("synonym1", "val1"), ("synonym2", "val2")}
-    concept_code_records = {("model1", "prop1", "val1", "code1")}
+    synonym_records = {"val1": {"synonym1"}, "val2": {"synonym2"}}
+    concept_code_records = {("model1", "prop1"): {("val1", "code1")}}
     
     mock_retrieve_api.return_value = (property_records, synonym_records, concept_code_records)
     mock_mongo_dao.upsert_property_pv.return_value = (True, "Success")
@@ -138,10 +153,12 @@ def test_pull_property_pv_synonym_concept_codes_success(
     mock_mongo_dao.upsert_property_pv.assert_called_once_with(property_records)
     
     # Verify synonyms were inserted
-    mock_mongo_dao.insert_synonyms.assert_called_once_with(list(synonym_records))
+    mock_mongo_dao.insert_synonyms.assert_called_once()
+    assert list(mock_mongo_dao.insert_synonyms.call_args[0][0]) == list(iter_synonym_records(synonym_records))
     
     # Verify concept codes were inserted
-    mock_mongo_dao.insert_concept_codes_v2.assert_called_once_with(list(concept_code_records))
+    mock_mongo_dao.insert_concept_codes_v2.assert_called_once()
+    assert list(mock_mongo_dao.insert_concept_codes_v2.call_args[0][0]) == list(iter_concept_code_records(concept_code_records))
 
 
 @patch('pv_puller_v2.retrieveAllPropertyViaAPI')
@@ -181,7 +198,7 @@ def test_pull_property_pv_synonym_concept_codes_upsert_failure(
     
     property_records = [{PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0"}]
     
-    mock_retrieve_api.return_value = (property_records, set(), set())
+    mock_retrieve_api.return_value = (property_records, {}, {})
     mock_mongo_dao.upsert_property_pv.return_value = (False, "Database error")
     
     puller = PVPullerV2(mock_configs, mock_mongo_dao, mock_api_client)
@@ -194,9 +211,7 @@ def test_pull_property_pv_synonym_concept_codes_upsert_failure(
 # ==================== Test retrieveAllPropertyViaAPI ====================
 
 @patch('pv_puller_v2.APIInvoker')
-@patch('pv_puller_v2.process_sts_property_pv')
 def test_retrieve_all_property_via_api_success(
-    mock_process_sts,
     mock_api_invoker_class,
     mock_configs,
     mock_logger
@@ -205,46 +220,48 @@ def test_retrieve_all_property_via_api_success(
     mock_api_client = MagicMock()
     mock_api_invoker_class.return_value = mock_api_client
     
-    api_results = [{"property": "prop1"}, {"property": "prop2"}]
-    processed_records = (
-        [{"property": "prop1"}, {"property": "prop2"}],
-        set(),
-        set()
-    )
-    
-    mock_api_client.get_all_data_elements_v2.return_value = [api_results]
-    mock_process_sts.return_value = processed_records
+    model1_results = [{PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0"}]
+    model2_results = [
+        {PROPERTY: "prop2", MODEL: "model2", VERSION: "1.0"},
+        {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0"}
+    ]
+    mock_api_client.iter_data_elements_v2.return_value = iter([model1_results, model2_results])
     
     pv_models = ["model1", "model2"]
-    result = retrieveAllPropertyViaAPI(mock_configs, pv_models, mock_logger)
+    property_records, synonym_map, concept_code_map = retrieveAllPropertyViaAPI(mock_configs, pv_models, mock_logger)
     
-    assert result == processed_records
-    mock_api_client.get_all_data_elements_v2.assert_called_once()
+    assert [record[PROPERTY] for record in property_records] == ["prop1", "prop2"]
+    assert synonym_map == {}
+    assert concept_code_map == {}
+    mock_api_client.iter_data_elements_v2.assert_called_once_with([
+        f"{mock_configs[STS_API_ALL_URL_V2]}/model1",
+        f"{mock_configs[STS_API_ALL_URL_V2]}/model2"
+    ])
 
 
-@patch('pv_puller_v2.process_sts_property_pv')
 def test_retrieve_all_property_via_api_with_explicit_client(
-    mock_process_sts,
     mock_api_client,
     mock_configs,
     mock_logger
 ):
     """Test API retrieval with explicitly provided client"""
-    api_results = [{"property": "prop1"}]
-    processed_records = ([{"property": "prop1"}], set(), set())
-    
-    mock_api_client.get_all_data_elements_v2.return_value = [api_results]
-    mock_process_sts.return_value = processed_records
+    api_results = [{
+        PROPERTY: "prop1",
+        MODEL: "model1",
+        VERSION: "1.0",
+        "permissibleValues": [{"value": "val1", "synonyms": ["syn1"], "ncit_concept_code": "C1"}]
+    }]
+    mock_api_client.iter_data_elements_v2.return_value = iter([api_results, None])
     
     pv_models = ["model1"]
-    result = retrieveAllPropertyViaAPI(mock_configs, pv_models, mock_logger, mock_api_client)
+    property_records, synonym_map, concept_code_map = retrieveAllPropertyViaAPI(mock_configs, pv_models, mock_logger, mock_api_client)
     
-    assert result == processed_records
+    assert len(property_records) == 1
+    assert set(iter_synonym_records(synonym_map)) == {("syn1", "val1")}
+    assert set(iter_concept_code_records(concept_code_map)) == {("model1", "prop1", "val1", "C1")}
 
 
-@patch('pv_puller_v2.process_sts_property_pv')
 def test_retrieve_all_property_via_api_empty_models(
-    mock_process_sts,
     mock_api_client,
     mock_configs,
     mock_logger
@@ -256,21 +273,16 @@ def test_retrieve_all_property_via_api_empty_models(
     assert "No model configured" in str(exc_info.value)
 
 
-@patch('pv_puller_v2.process_sts_property_pv')
 def test_retrieve_all_property_via_api_no_results(
-    mock_process_sts,
     mock_api_client,
     mock_configs,
     mock_logger
 ):
     """Test handling when API returns no results"""
-    mock_api_client.get_all_data_elements_v2.return_value = [None, None]
+    mock_api_client.iter_data_elements_v2.return_value = iter([None, None])
     
     pv_models = ["model1", "model2"]
     
-    # Should return None from process_sts_property_pv when no results
-    mock_process_sts.return_value = (None, None, None)
-    
     result = retrieveAllPropertyViaAPI(mock_configs, pv_models, mock_logger, mock_api_client)
     
     assert result == (None, None, None)
@@ -295,12 +307,12 @@ def test_process_sts_property_pv_success(mock_logger):
         }
     ]
     
-    property_records, synonym_set, concept_code_set = process_sts_property_pv(sts_results, mock_logger)
+    property_records, synonym_map, concept_code_map = process_sts_property_pv(sts_results, mock_logger)
     
     assert len(property_records) == 1
     assert property_records[0][PROPERTY] == "Property1"
-    assert len(synonym_set) == 2
-    assert len(concept_code_set) == 1
+    assert count_records(synonym_map) == 2
+    assert count_records(concept_code_map) == 1
 
 
 def test_process_sts_property_pv_empty_results(mock_logger):
@@ -363,13 +375,13 @@ def test_process_sts_property_pv_property_only_flag(mock_logger):
         }
     ]
     
-    property_records, synonym_set, concept_code_set = process_sts_property_pv(
+    property_records, synonym_map, concept_code_map = process_sts_property_pv(
         sts_results, mock_logger, property_only=True
     )
     
     assert len(property_records) == 1
-    assert len(synonym_set) == 0
-    assert len(concept_code_set) == 0
+    assert count_records(synonym_map) == 0
+    assert count_records(concept_code_map) == 0
 
 
 # ==================== Test extract_pv_list ====================
@@ -470,145 +482,91 @@ def test_compose_property_record_null_version():
     assert record[VERSION] is None
 
 
-# ==================== Test compose_synonym_record ====================
-
-def test_compose_synonym_record_success():
-    """Test successful synonym record composition"""
+def test_compose_property_record_converts_to_document():
+    """Test property record reads like the propertyPVs document"""
     property_item = {
-        "permissibleValues": [
-            {
-                "value": "val1",
-                "synonyms": ["syn1", "syn2"]
-            },
-            {
-                "value": "val2",
-                "synonyms": ["syn3"]
-            }
-        ]
+        PROPERTY: "Property1",
+        MODEL: "Model1",
+        VERSION: "1.0.0",
+        "permissibleValues": [{"value": "val1"}]
     }
-    
-    synonym_set = set()
-    compose_synonym_record(property_item, synonym_set)
-    
-    assert len(synonym_set) == 3
-    assert ("syn1", "val1") in synonym_set
-    assert ("syn2", "val1") in synonym_set
-    assert ("syn3", "val2") in synonym_set
 
+    record = compose_property_record(property_item)
+
+    assert dict(record) == {PROPERTY: "Property1", MODEL: "Model1", VERSION: "1.0.0", PROPERTY_PERMISSIBLE_VALUES: ["val1"]}
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(KeyError):
+        record["unknown"]
+
+
+# ==================== Test process_sts_property_pv_chunk ====================
+
+def _process_pv_list(pv_list):
+    """Process one STS property item with the given pv list, return (synonym map, concept code map)"""
+    item = {PROPERTY: "Property1", MODEL: "Model1", VERSION: "1.0", "permissibleValues": pv_list}
+    synonym_map = defaultdict(set)
+    concept_code_map = defaultdict(set)
+    process_sts_property_pv_chunk([item], {}, synonym_map, concept_code_map)
+    return synonym_map, concept_code_map
+
+
+def test_process_sts_property_pv_chunk_synonyms():
+    """Test synonyms are collected per value"""
+    synonym_map, _ = _process_pv_list([
+        {"value": "val1", "synonyms": ["syn1", "syn2"]},
+        {"value": "val2", "synonyms": ["syn3"]}
+    ])
 
-def test_compose_synonym_record_no_synonyms():
+    assert set(iter_synonym_records(synonym_map)) == {("syn1", "val1"), ("syn2", "val1"), ("syn3", "val2")}
+
+
+def test_process_sts_property_pv_chunk_no_synonyms():
     """Test when there are no synonyms"""
-    property_item = {
-        "permissibleValues": [
-            {"value": "val1"}
-        ]
-    }
-    
-    synonym_set = set()
-    compose_synonym_record(property_item, synonym_set)
-    
-    assert len(synonym_set) == 0
+    synonym_map, _ = _process_pv_list([{"value": "val1"}])
+
+    assert count_records(synonym_map) == 0
 
 
-def test_compose_synonym_record_duplicate_synonyms():
+def test_process_sts_property_pv_chunk_duplicate_synonyms():
     """Test that duplicate synonyms are not added"""
-    property_item = {
-        "permissibleValues": [
-            {
-                "value": "val1",
-                "synonyms": ["syn1", "syn1"]
-            }
-        ]
-    }
-    
-    synonym_set = set()
-    compose_synonym_record(property_item, synonym_set)
-    
-    # Sets automatically handle duplicates
-    assert len(synonym_set) == 1
+    synonym_map, _ = _process_pv_list([{"value": "val1", "synonyms": ["syn1", "syn1"]}])
+
+    assert count_records(synonym_map) == 1
 
 
-def test_compose_synonym_record_lowercases_term():
+def test_process_sts_property_pv_chunk_lowercases_synonyms():
     """Synonym terms are stored lowercase; case variants dedupe."""
-    property_item = {
-        "permissibleValues": [
-            {
-                "value": "val1",
-                "synonyms": ["Foo", " FOO ", "foo"]
-            }
-        ]
-    }
-    synonym_set = set()
-    compose_synonym_record(property_item, synonym_set)
-    assert len(synonym_set) == 1
-    assert ("foo", "val1") in synonym_set
+    synonym_map, _ = _process_pv_list([{"value": "val1", "synonyms": ["Foo", " FOO ", "foo"]}])
 
+    assert set(iter_synonym_records(synonym_map)) == {("foo", "val1")}
 
-def test_compose_synonym_record_none_pv_list():
+
+def test_process_sts_property_pv_chunk_none_pv_list():
     """Test with None permissibleValues list"""
-    property_item = {"permissibleValues": None}
-    
-    synonym_set = set()
-    compose_synonym_record(property_item, synonym_set)
-    
-    assert len(synonym_set) == 0
+    synonym_map, concept_code_map = _process_pv_list(None)
 
+    assert count_records(synonym_map) == 0
+    assert count_records(concept_code_map) == 0
 
-# ==================== Test compose_concept_code_record ====================
 
-def test_compose_concept_code_record_success():
-    """Test successful concept code record composition"""
-    property_item = {
-        MODEL: "Model1",
-        PROPERTY: "Property1",
-        "permissibleValues": [
-            {
-                "value": "val1",
-                "ncit_concept_code": "C12345"
-            },
-            {
-                "value": "val2",
-                "ncit_concept_code": "C67890"
-            }
-        ]
+def test_process_sts_property_pv_chunk_concept_codes():
+    """Test concept codes are collected per model and property"""
+    _, concept_code_map = _process_pv_list([
+        {"value": "val1", "ncit_concept_code": "C12345"},
+        {"value": "val2", "ncit_concept_code": "C67890"}
+    ])
+
+    assert set(iter_concept_code_records(concept_code_map)) == {
+        ("Model1", "Property1", "val1", "C12345"),
+        ("Model1", "Property1", "val2", "C67890")
     }
-    
-    concept_code_set = set()
-    compose_concept_code_record(property_item, concept_code_set)
-    
-    assert len(concept_code_set) == 2
-    assert ("Model1", "Property1", "val1", "C12345") in concept_code_set
-    assert ("Model1", "Property1", "val2", "C67890") in concept_code_set
 
 
-def test_compose_concept_code_record_no_concept_codes():
+def test_process_sts_property_pv_chunk_no_concept_codes():
     """Test when there are no concept codes"""
-    property_item = {
-        MODEL: "Model1",
-        PROPERTY: "Property1",
-        "permissibleValues": [
-            {"value": "val1"}
-        ]
-    }
-    
-    concept_code_set = set()
-    compose_concept_code_record(property_item, concept_code_set)
-    
-    assert len(concept_code_set) == 0
-
+    _, concept_code_map = _process_pv_list([{"value": "val1"}])
 
-def test_compose_concept_code_record_none_pv_list():
-    """Test with None permissibleValues list"""
-    property_item = {
-        MODEL: "Model1",
-        PROPERTY: "Property1",
-        "permissibleValues": None
-    }
-    
-    concept_code_set = set()
-    compose_concept_code_record(property_item, concept_code_set)
-    
-    assert len(concept_code_set) == 0
+    assert count_records(concept_code_map) == 0
 
 
 # ==================== Test get_pv_by_property_version ====================
@@ -630,7 +588,7 @@ def test_get_pv_by_property_version_success(
         {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val1"]}
     ]
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
-    mock_process_sts.return_value = (property_records, set(), set())
+    mock_process_sts.return_value = (property_records, {}, {})
     
     mock_mongo_dao.upsert_property_pv.return_value = (True, "Success")
     
@@ -679,7 +637,7 @@ def test_get_pv_by_property_version_no_version(
     ]
     
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
-    mock_process_sts.return_value = (property_records, set(), set())
+    mock_process_sts.return_value = (property_records, {}, {})
     mock_mongo_dao.upsert_property_pv.return_value = (True, "Success")
     
     result = get_pv_by_property_version(configs, mock_logger, "prop1", None, "model1", mock_mongo_dao)
@@ -764,6 +722,25 @@ def test_pull_pv_lists_v2_exception(
     mock_logger.critical.assert_called()
 
 
+@patch('pv_puller_v2.PVPullerV2')
+@patch('pv_puller_v2.APIInvoker')
+@patch('pv_puller_v2.get_logger')
+def test_pull_pv_lists_v2_no_models(
+    mock_get_logger,
+    mock_api_invoker_class,
+    mock_puller_class,
+    mock_configs
+):
+    """Test that no API client is built when no model is configured"""
+    mock_mongo_dao = MagicMock()
+    mock_mongo_dao.get_configuration_by_ev_var.return_value = None
+
+    pull_pv_lists_v2(mock_configs, mock_mongo_dao)
+
+    mock_api_invoker_class.assert_not_called()
+    mock_puller_class.assert_not_called()
+
+
 # ==================== Test get_all_pvs_by_version ====================
 
 @patch('pv_puller_v2.APIInvoker')
@@ -782,8 +759,8 @@ def test_get_all_pvs_by_version_success(
     property_records = [
         {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val1", "val2"]}
     ]
-    synonym_records = {("syn1", "val1"), ("syn2", "val2")}
-    concept_code_records = {("model1", "prop1", "val1", "C123"), ("model1", "prop1", "val2", "C456")}
+    synonym_records = {"val1": {"syn1"}, "val2": {"syn2"}}
+    concept_code_records = {("model1", "prop1"): {("val1", "C123"), ("val2", "C456")}}
     
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
     mock_process_sts.return_value = (property_records, synonym_records, concept_code_records)
@@ -803,8 +780,10 @@ def test_get_all_pvs_by_version_success(
     
     # Verify data was saved
     mock_mongo_dao.upsert_property_pv.assert_called_once_with(property_records)
-    mock_mongo_dao.insert_synonyms.assert_called_once_with(list(synonym_records))
-    mock_mongo_dao.insert_concept_codes_v2.assert_called_once_with(list(concept_code_records))
+    mock_mongo_dao.insert_synonyms.assert_called_once()
+    assert list(mock_mongo_dao.insert_synonyms.call_args[0][0]) == list(iter_synonym_records(synonym_records))
+    mock_mongo_dao.insert_concept_codes_v2.assert_called_once()
+    assert list(mock_mongo_dao.insert_concept_codes_v2.call_args[0][0]) == list(iter_concept_code_records(concept_code_records))
 
 
 @patch('pv_puller_v2.APIInvoker')
@@ -836,7 +815,7 @@ def test_get_all_pvs_by_version_no_properties(
     mock_api_invoker_class.return_value = mock_api_client
     
     mock_api_client.get_all_data_elements.return_value = []
-    mock_process_sts.return_value = (None, set(), set())
+    mock_process_sts.return_value = (None, {}, {})
     
     mock_mongo_dao.upsert_property_pv.return_value = (False, "Failed")
     
@@ -864,7 +843,7 @@ def test_get_all_pvs_by_version_no_synonyms(
     ]
     
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
-    mock_process_sts.return_value = (property_records, set(), set())  # Empty synonyms set
+    mock_process_sts.return_value = (property_records, {}, {})  # Empty synonyms set
     
     mock_mongo_dao.upsert_property_pv.return_value = (True, "Success")
     mock_mongo_dao.insert_synonyms.return_value = True
@@ -891,10 +870,10 @@ def test_get_all_pvs_by_version_no_concept_codes(
     property_records = [
         {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val1"]}
     ]
-    synonym_records = {("syn1", "val1")}
+    synonym_records = {"val1": {"syn1"}}
     
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
-    mock_process_sts.return_value = (property_records, synonym_records, set())  # Empty concept codes set
+    mock_process_sts.return_value = (property_records, synonym_records, {})  # Empty concept codes set
     
     mock_mongo_dao.upsert_property_pv.return_value = (True, "Success")
     mock_mongo_dao.insert_synonyms.return_value = True
@@ -924,7 +903,7 @@ def test_get_all_pvs_by_version_upsert_failure(
     ]
     
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
-    mock_process_sts.return_value = (property_records, set(), set())
+    mock_process_sts.return_value = (property_records, {}, {})
     
     mock_mongo_dao.upsert_property_pv.return_value = (False, "Database error")
     
@@ -950,10 +929,10 @@ def test_get_all_pvs_by_version_insert_synonyms_none(
     property_records = [
         {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val1"]}
     ]
-    synonym_records = {("syn1", "val1")}
+    synonym_records = {"val1": {"syn1"}}
     
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
-    mock_process_sts.return_value = (property_records, synonym_records, set())
+    mock_process_sts.return_value = (property_records, synonym_records, {})
     
     mock_mongo_dao.upsert_property_pv.return_value = (True, "Success")
     mock_mongo_dao.insert_synonyms.return_value = None  # Returns None indicating failure
@@ -980,8 +959,8 @@ def test_get_all_pvs_by_version_insert_concept_codes_none(
     property_records = [
         {PROPERTY: "prop1", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val1"]}
     ]
-    synonym_records = {("syn1", "val1")}
-    concept_code_records = {("model1", "prop1", "val1", "C123")}
+    synonym_records = {"val1": {"syn1"}}
+    concept_code_records = {("model1", "prop1"): {("val1", "C123")}}
     
     mock_api_client.get_all_data_elements.return_value = [{"property": "prop1"}]
     mock_process_sts.return_value = (property_records, synonym_records, concept_code_records)
@@ -1037,11 +1016,11 @@ def test_get_all_pvs_by_version_multiple_records(
         {PROPERTY: "prop2", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val2"]},
         {PROPERTY: "prop3", MODEL: "model1", VERSION: "1.0", PROPERTY_PERMISSIBLE_VALUES: ["val3"]}
     ]
-    synonym_records = {("syn1", "val1"), ("syn2", "val1"), ("syn3", "val2"), ("syn4", "val3")}
+    synonym_records = {"val1": {"syn1", "syn2"}, "val2": {"syn3"}, "val3": {"syn4"}}
     concept_code_records = {
-        ("model1", "prop1", "val1", "C111"),
-        ("model1", "prop2", "val2", "C222"),
-        ("model1", "prop3", "val3", "C333")
+        ("model1", "prop1"): {("val1", "C111")},
+        ("model1", "prop2"): {("val2", "C222")},
+        ("model1", "prop3"): {("val3", "C333")}
     }
     
     mock_api_client.get_all_data_elements.return_value = [
@@ -1059,8 +1038,8 @@ def test_get_all_pvs_by_version_multiple_records(
     
     # Verify all data was saved
     mock_mongo_dao.upsert_property_pv.assert_called_once_with(property_records)
-    assert len(mock_mongo_dao.insert_synonyms.call_args[0][0]) == 4
-    assert len(mock_mongo_dao.insert_concept_codes_v2.call_args[0][0]) == 3
+    assert len(list(mock_mongo_dao.insert_synonyms.call_args[0][0])) == 4
+    assert len(list(mock_mongo_dao.insert_concept_codes_v2.call_args[0][0])) == 3
 
 
 @patch('pv_puller_v2.APIInvoker')
@@ -1114,7 +1093,7 @@ def test_pv_puller_integration_full_flow(
         ]
     }]
     
-    mock_api_client.get_all_data_elements_v2.return_value = [api_results]
+    mock_api_client.iter_data_elements_v2.return_value = iter([api_results])
     
     # Setup MongoDB mock
     mock_mongo_dao.upsert_property_pv.return_value = (True, "Success")